@@ -6,8 +6,10 @@ from src.core.workflow import VoiceProcessingWorkflow
 from src.core.config import Config
 from src.core.state import ProcessingResult
 from src.chains import LLMFactory
-from pathlib import Path
+import os
+from os.path import exists as _exists, getsize as _getsize
 import shutil
+import tempfile
 
 class VoiceProcessingService:
     """음성 처리 비즈니스 로직"""
@@ -25,7 +27,7 @@ class VoiceProcessingService:
     def process_audio_file(self, audio_file_path: str) -> ProcessingResult:
         """오디오 파일 처리"""
         # 파일 존재 확인
-        if not Path(audio_file_path).exists():
+        if not _exists(audio_file_path):
             return ProcessingResult(
                 success=False,
                 session_id="",
@@ -33,7 +35,7 @@ class VoiceProcessingService:
             )
         
         # 파일 크기 확인
-        file_size_mb = Path(audio_file_path).stat().st_size / (1024 * 1024)
+        file_size_mb = _getsize(audio_file_path) / (1024 * 1024)
         if file_size_mb > Config.MAX_AUDIO_SIZE_MB:
             return ProcessingResult(
                 success=False,
@@ -46,30 +48,31 @@ class VoiceProcessingService:
     
     def process_uploaded_audio(self, uploaded_file, original_filename: str) -> ProcessingResult:
         """업로드된 오디오 파일 처리 (Streamlit/FastAPI용)"""
-        from src.utils.file_utils import safe_filename_for_temp
-        
-        # 안전한 임시 파일명 생성 (한글 파일명 지원)
-        safe_filename = safe_filename_for_temp(original_filename)
-        temp_path = Config.TEMP_DIR / safe_filename
+        temp_path = None
         
         try:
             # 임시 디렉토리 생성 (존재하지 않는 경우)
             Config.TEMP_DIR.mkdir(parents=True, exist_ok=True)
             
-            # 파일 저장 (UTF-8 경로 지원)
+            # 고유한 임시 파일 생성 (O_CREAT|O_EXCL로 원자적 생성, 원본 파일명은 확장자만 사용)
+            suffix = os.path.splitext(original_filename)[1]
+            fd, temp_path = tempfile.mkstemp(dir=Config.TEMP_DIR, prefix="temp_", suffix=suffix)
+            
+            # 파일 저장
             if hasattr(uploaded_file, 'read'):
                 # Streamlit UploadedFile
-                with open(temp_path, 'wb') as f:
+                with os.fdopen(fd, 'wb') as f:
                     uploaded_file.seek(0)  # 파일 포인터를 처음으로
                     f.write(uploaded_file.read())
                 print(f"✅ 파일 저장 완료: {temp_path}")
             else:
                 # 일반 파일 객체
+                os.close(fd)
                 shutil.copy(uploaded_file, temp_path)
                 print(f"✅ 파일 복사 완료: {temp_path}")
             
             # 처리 실행
-            result = self.process_audio_file(str(temp_path))
+            result = self.process_audio_file(temp_path)
             
             return result
             
@@ -80,9 +83,12 @@ class VoiceProcessingService:
                 error_message=f"파일 처리 오류: {str(e)}"
             )
         finally:
-            # 임시 파일 정리
-            if temp_path.exists():
-                temp_path.unlink()
+            # 임시 파일 정리 (존재 확인 없이 바로 삭제 시도)
+            if temp_path is not None:
+                try:
+                    os.unlink(temp_path)
+                except FileNotFoundError:
+                    pass
     
     def get_provider_status(self) -> dict:
         """현재 LLM 제공자 상태 정보 반환"""
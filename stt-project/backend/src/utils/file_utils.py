@@ -1,11 +1,67 @@
 """
 파일 처리 유틸리티
 """
+import itertools
+import os
 import re
+import threading
+import time
 import unicodedata
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
+# 자주 호출되는 정규식은 모듈 로드 시 한 번만 컴파일
+_DANGEROUS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+_WS_RE = re.compile(r'\s+')
+_DOT_RE = re.compile(r'\.+')
+_HANGUL_RE = re.compile(r'[\uac00-\ud7a3]')
+
+# ensure_unique_filename 탐색 결과 캐시: (부모 경로, 이름, 확장자) -> (마지막 번호, 기록 시각)
+_UNIQUE_COUNTERS: dict[tuple[str, str, str], tuple[int, float]] = {}
+_UNIQUE_COUNTERS_LOCK = threading.Lock()
+_UNIQUE_COUNTER_TTL = 60  # 초
+_UNIQUE_COUNTERS_MAX = 256
+
+# safe_filename_for_temp 일괄 처리용 일련번호
+_BATCH_SEQ = itertools.count()
+
+@lru_cache(maxsize=1024)
+def _sanitize_parts(filename: str) -> tuple[str, str]:
+    """
+    파일명을 (정리된 이름, 확장자)로 분리/정리 (순수 함수라 결과를 캐시)
+    
+    이름은 길이 제한까지 적용된 상태로 반환한다. 정리 후 이름이 비어 있으면 빈 문자열을 반환하며,
+    타임스탬프 대체는 호출하는 쪽에서 처리한다.
+    """
+    # 파일명과 확장자 분리
+    path = Path(filename)
+    name = path.stem
+    extension = path.suffix
+    
+    if name.isascii() and name.isprintable() and not _DANGEROUS_RE.search(name):
+        # 일반적인 ASCII 파일명: 정규화/치환 없이 필요한 경우에만 공백/점 정리
+        if '  ' in name:
+            name = _WS_RE.sub(' ', name)
+        if '..' in name:
+            name = _DOT_RE.sub('.', name)
+    else:
+        # Unicode 정규화 (NFC 형식으로 통일)
+        name = unicodedata.normalize('NFC', name)
+        
+        # 위험한 문자 제거 (파일시스템에서 문제가 될 수 있는 문자들)
+        name = _DANGEROUS_RE.sub('_', name)
+        
+        # 연속된 공백이나 점을 하나로 줄이기
+        name = _WS_RE.sub(' ', name)
+        name = _DOT_RE.sub('.', name)
+    
+    # 앞뒤 공백과 점 제거 + 파일명 길이 제한 (255자 제한, 확장자 포함, 여유분 10자)
+    max_length = 255 - len(extension) - 10
+    name = name.strip(' .')[:max_length]
+    
+    return name, extension
+
 def sanitize_filename(filename: str) -> str:
     """
     파일명을 시스템에서 안전하게 사용할 수 있도록 정리
@@ -19,34 +75,12 @@ def sanitize_filename(filename: str) -> str:
     if not filename:
         return f"audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
-    # 파일명과 확장자 분리
-    path = Path(filename)
-    name = path.stem
-    extension = path.suffix
-    
-    # Unicode 정규화 (NFC 형식으로 통일)
-    name = unicodedata.normalize('NFC', name)
-    
-    # 위험한 문자 제거 (파일시스템에서 문제가 될 수 있는 문자들)
-    dangerous_chars = r'[<>:"/\\|?*\x00-\x1f]'
-    name = re.sub(dangerous_chars, '_', name)
-    
-    # 연속된 공백이나 점을 하나로 줄이기
-    name = re.sub(r'\s+', ' ', name)
-    name = re.sub(r'\.+', '.', name)
-    
-    # 앞뒤 공백과 점 제거
-    name = name.strip(' .')
+    name, extension = _sanitize_parts(filename)
     
     # 빈 이름인 경우 타임스탬프 사용
     if not name:
         name = f"audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
-    # 파일명 길이 제한 (255자 제한, 확장자 포함)
-    max_length = 255 - len(extension) - 10  # 여유분 10자
-    if len(name) > max_length:
-        name = name[:max_length]
-    
     return f"{name}{extension}"
 
 def ensure_unique_filename(file_path: Path) -> Path:
@@ -59,27 +93,56 @@ def ensure_unique_filename(file_path: Path) -> Path:
     Returns:
         고유한 파일 경로
     """
-    if not file_path.exists():
+    if not os.path.exists(file_path):
         return file_path
     
+    # 후보 경로는 문자열로 만들어 Path 객체 생성을 반환 시점 한 번으로 제한
+    parent = os.fspath(file_path.parent)
     stem = file_path.stem
     suffix = file_path.suffix
-    parent = file_path.parent
     
-    counter = 1
+    # 같은 파일명이 연속으로 들어오는 경우 마지막으로 찾은 빈 번호부터 탐색
+    key = (parent, stem, suffix)
+    now = time.monotonic()
+    with _UNIQUE_COUNTERS_LOCK:
+        cached = _UNIQUE_COUNTERS.get(key)
+        counter = cached[0] if cached and now - cached[1] < _UNIQUE_COUNTER_TTL else 1
+    
     while True:
-        new_name = f"{stem}_{counter}{suffix}"
-        new_path = parent / new_name
-        if not new_path.exists():
-            return new_path
+        candidate = os.path.join(parent, f"{stem}_{counter}{suffix}")
+        if not os.path.exists(candidate):
+            break
         counter += 1
+    
+    with _UNIQUE_COUNTERS_LOCK:
+        # 오래된 항목 정리로 메모리 사용량 제한
+        if len(_UNIQUE_COUNTERS) >= _UNIQUE_COUNTERS_MAX:
+            for stale in [k for k, (_, ts) in _UNIQUE_COUNTERS.items() if now - ts >= _UNIQUE_COUNTER_TTL]:
+                del _UNIQUE_COUNTERS[stale]
+            if len(_UNIQUE_COUNTERS) >= _UNIQUE_COUNTERS_MAX:
+                _UNIQUE_COUNTERS.clear()
+        _UNIQUE_COUNTERS[key] = (counter, now)
+    
+    return Path(candidate)
+
+def temp_timestamp() -> str:
+    """
+    임시 파일명에 쓰이는 타임스탬프 생성 (밀리초 3자리 포함)
+    
+    일괄 업로드 시 한 번만 호출해 safe_filename_for_temp의 batch_ts로 넘기면
+    파일마다 시계를 다시 읽지 않아도 된다.
+    """
+    now = time.time()
+    return f"{time.strftime('%Y%m%d_%H%M%S', time.localtime(now))}_{int(now * 1000) % 1000:03d}"
 
-def safe_filename_for_temp(original_filename: str) -> str:
+def safe_filename_for_temp(original_filename: str, batch_ts: str | None = None) -> str:
     """
     임시 파일을 위한 안전한 파일명 생성
     
     Args:
         original_filename: 원본 파일명
+        batch_ts: 일괄 처리용 공통 타임스탬프 (temp_timestamp() 결과).
+            지정하면 시계를 읽는 대신 증가하는 일련번호를 붙여 중복을 방지
     
     Returns:
         임시 파일용 안전한 파일명
@@ -88,7 +151,10 @@ def safe_filename_for_temp(original_filename: str) -> str:
     clean_name = sanitize_filename(original_filename)
     
     # 타임스탬프 추가로 중복 방지
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:19]  # 마이크로초 3자리
+    if batch_ts is None:
+        timestamp = temp_timestamp()
+    else:
+        timestamp = f"{batch_ts}_{next(_BATCH_SEQ)}"
     
     path = Path(clean_name)
     stem = path.stem
@@ -111,13 +177,19 @@ def get_file_encoding_info(file_path: Path) -> dict:
         filename = str(file_path)
         filename_bytes = filename.encode('utf-8')
         
+        # UTF-8 바이트 길이가 문자 수와 같으면 ASCII
+        is_ascii = len(filename_bytes) == len(filename)
+        
+        # ASCII 파일명에는 한글이 없으므로 정규식 검색 생략
+        contains_korean = not is_ascii and bool(_HANGUL_RE.search(filename))
+        
         return {
             'filename': filename,
             'filename_utf8': filename,
             'filename_bytes_length': len(filename_bytes),
-            'is_ascii': filename.isascii(),
-            'contains_korean': bool(re.search(r'[가-힣]', filename)),
-            'normalized': unicodedata.normalize('NFC', filename)
+            'is_ascii': is_ascii,
+            'contains_korean': contains_korean,
+            'normalized': filename if is_ascii else unicodedata.normalize('NFC', filename)
         }
     except Exception as e:
         return {
@@ -13,22 +13,19 @@ from datetime import datetime
 current_dir = Path.cwd()
 file_dir = Path(__file__).parent
 
-# 가능한 프로젝트 루트 경로들 확인
-possible_roots = [
-    file_dir,  # streamlit_app.py가 있는 디렉토리 (로컬)
-    current_dir,  # 현재 작업 디렉토리 (Streamlit Cloud)
-    Path("/mount/src/rag/stt-project/backend"),  # Streamlit Cloud 절대 경로
-]
-
-project_root = None
-for root in possible_roots:
-    if root.exists() and (root / "src").exists():
-        project_root = root
-        break
-
-if project_root is None:
+@st.cache_resource(show_spinner=False)
+def _find_project_root(file_dir: str, current_dir: str) -> Path:
+    """src 폴더가 있는 프로젝트 루트 탐색 (스크립트 재실행 시에는 캐시 사용)"""
+    if os.path.isdir(os.path.join(file_dir, "src")):
+        return Path(file_dir)  # streamlit_app.py가 있는 디렉토리 (로컬)
+    if os.path.isdir(os.path.join(current_dir, "src")):
+        return Path(current_dir)  # 현재 작업 디렉토리 (Streamlit Cloud)
+    if os.path.isdir("/mount/src/rag/stt-project/backend/src"):
+        return Path("/mount/src/rag/stt-project/backend")  # Streamlit Cloud 절대 경로
     # fallback: 현재 디렉토리 사용
-    project_root = current_dir
+    return Path(current_dir)
+
+project_root = _find_project_root(str(file_dir), str(current_dir))
 
 # Python path에 추가
 if str(project_root) not in sys.path:
@@ -54,7 +51,8 @@ from src.services.voice_service import VoiceProcessingService
 from src.core.config import Config
 from src.chains.llm_factory import LLMFactory
 
-# 환경 변수 및 LLM 연결 상태 확인
+# 환경 변수 및 LLM 연결 상태 확인 (재실행마다 확인하지 않도록 30초 캐시)
+@st.cache_data(ttl=30, show_spinner=False)
 def check_environment():
     """환경 변수 및 LLM 연결 상태 확인"""
     env_status = {}
@@ -75,6 +73,22 @@ def check_environment():
     
     return env_status
 
+# LLM 제공자 설정 (세션 중에는 바뀌지 않으므로 한 번만 계산)
+@st.cache_resource(show_spinner=False)
+def _cached_llm_cfg():
+    """현재 LLM 제공자 이름과 설정 반환"""
+    return Config.get_current_llm_provider().value, Config.get_llm_config()
+
+# Ollama 서버 연결 확인 (재실행마다 HTTP 요청하지 않도록 10초 캐시)
+@st.cache_data(ttl=10, show_spinner=False)
+def _probe_ollama(base_url: str):
+    """Ollama 서버 응답 코드 반환 (연결 실패 시 None)"""
+    try:
+        import requests
+        return requests.get(base_url, timeout=5).status_code
+    except Exception:
+        return None
+
 # 배포 디버그 정보 (배포 환경에서 확인용)
 with st.expander("🔍 **배포 디버그 정보**", expanded=False):
     st.write(f"**현재 작업 디렉토리**: {Path.cwd()}")
@@ -108,6 +122,10 @@ with st.expander("🔍 **배포 디버그 정보**", expanded=False):
 
 st.write("---")
 
+# 해시태그 표시용 스타일
+_TAG_STYLE = 'background-color:#e1f5fe;color:#000;padding:4px 8px;border-radius:12px;margin:2px;display:inline-block;font-weight:500'
+_TAG_STYLE_BLOCK = f"<style>.stt-tag{{{_TAG_STYLE}}}</style>"
+
 # Streamlit 페이지 설정
 st.set_page_config(
     page_title="🎙️ 음성 처리 시스템",
@@ -125,8 +143,7 @@ def render_sidebar():
         st.markdown("## 🤖 LLM 제공자 설정")
         
         # 현재 설정 확인
-        current_provider = Config.get_current_llm_provider().value
-        llm_config = Config.get_llm_config()
+        current_provider, llm_config = _cached_llm_cfg()
         
         # 제공자 선택
         provider_options = ["ollama", "openai"]
@@ -153,14 +170,12 @@ def render_sidebar():
         
         # 제공자별 상태 표시
         if selected_provider == "ollama":
-            try:
-                import requests
-                response = requests.get(Config.OLLAMA_BASE_URL, timeout=5)
-                if response.status_code == 200:
-                    st.success(f"🦙 Ollama 연결됨 ({Config.OLLAMA_MODEL})")
-                else:
-                    st.error("❌ Ollama 연결 실패")
-            except:
+            status_code = _probe_ollama(Config.OLLAMA_BASE_URL)
+            if status_code == 200:
+                st.success(f"🦙 Ollama 연결됨 ({Config.OLLAMA_MODEL})")
+            elif status_code is not None:
+                st.error("❌ Ollama 연결 실패")
+            else:
                 st.error("❌ Ollama 서버 없음")
                 st.code("ollama serve")
         
@@ -223,7 +238,7 @@ def main():
             return None
     
     # 현재 설정된 provider로 서비스 초기화
-    current_provider = Config.get_current_llm_provider().value
+    current_provider, _ = _cached_llm_cfg()
     voice_service = get_voice_service(current_provider)
     if voice_service is None:
         st.stop()
@@ -406,10 +421,10 @@ def main():
                 
                 if result.tags:
                     # 해시태그를 예쁘게 표시
-                    tag_html = " ".join([
-                        f'<span style="background-color: #e1f5fe; color: #000000; padding: 4px 8px; border-radius: 12px; margin: 2px; display: inline-block; font-weight: 500;">{tag}</span>'
-                        for tag in result.tags
-                    ])
+                    # (스타일은 CSS 클래스로 한 번만 정의하고 태그에는 클래스만 지정)
+                    tag_html = _TAG_STYLE_BLOCK + " ".join(
+                        f'<span class="stt-tag">{tag}</span>' for tag in result.tags
+                    )
                     st.markdown(tag_html, unsafe_allow_html=True)
                     
                     # 복사 가능한 텍스트
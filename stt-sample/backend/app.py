@@ -229,38 +229,47 @@
 """Streamlit Cloud optimized application."""
 
 import streamlit as st
+import asyncio
 import tempfile
 import os
 from pathlib import Path
 from datetime import datetime
-import json
-import whisper
+import orjson
+import hashlib
+import re
+from collections import Counter
 from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
 import io
+import numpy as np
 import ffmpeg
 
 # FFmpeg 경로 설정 (Streamlit Cloud용)
 import shutil
+import logging
 
-# FFmpeg 경로 찾기 및 설정
-ffmpeg_path = shutil.which("ffmpeg")
-ffprobe_path = shutil.which("ffprobe")
+from json_cache import load_cached, save_cached
 
-st.write(f"- FFmpeg 경로: {ffmpeg_path}")
-st.write(f"- FFprobe 경로: {ffprobe_path}")
+logger = logging.getLogger(__name__)
 
-if ffmpeg_path:
-    AudioSegment.converter = ffmpeg_path
-    st.write(f"✅ FFmpeg 경로 설정: {ffmpeg_path}")
-else:
-    st.warning("⚠️ FFmpeg를 찾을 수 없습니다.")
-
-if ffprobe_path:
-    AudioSegment.ffprobe = ffprobe_path
-    st.write(f"✅ FFprobe 경로 설정: {ffprobe_path}")
-else:
-    st.warning("⚠️ FFprobe를 찾을 수 없습니다.")
+@st.cache_resource(show_spinner=False)
+def _configure_ffmpeg():
+    """Find ffmpeg/ffprobe once per worker and register them with pydub."""
+    ffmpeg_path = shutil.which("ffmpeg")
+    ffprobe_path = shutil.which("ffprobe")
+    
+    if ffmpeg_path:
+        AudioSegment.converter = ffmpeg_path
+        logger.info("FFmpeg 경로 설정: %s", ffmpeg_path)
+    else:
+        logger.warning("FFmpeg를 찾을 수 없습니다.")
+    
+    if ffprobe_path:
+        AudioSegment.ffprobe = ffprobe_path
+        logger.info("FFprobe 경로 설정: %s", ffprobe_path)
+    else:
+        logger.warning("FFprobe를 찾을 수 없습니다.")
+    
+    return ffmpeg_path, ffprobe_path
 
 # 환경 감지
 IS_STREAMLIT_CLOUD = os.getenv("STREAMLIT_SHARING_MODE") == "true"
@@ -269,14 +278,20 @@ IS_STREAMLIT_CLOUD = os.getenv("STREAMLIT_SHARING_MODE") == "true"
 if IS_STREAMLIT_CLOUD:
     OPENAI_API_KEY = st.secrets.get("OPENAI_API_KEY", "")
     WHISPER_MODEL_SIZE = st.secrets.get("WHISPER_MODEL_SIZE", "tiny")
+    WHISPER_BATCH_SIZE = int(st.secrets.get("WHISPER_BATCH_SIZE", "1"))
     MAX_FILE_SIZE_MB = int(st.secrets.get("MAX_FILE_SIZE_MB", "50"))
 else:
     from dotenv import load_dotenv
     load_dotenv()
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+    WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "")
+    WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
     MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "100"))
 
+# 미리 받아둔 모델 위치 (download_models.py로 생성, 없으면 최초 실행 시 다운로드)
+WHISPER_MODEL_DIR = os.getenv("WHISPER_MODEL_DIR", str(Path(__file__).parent / "models"))
+
 # Page config
 st.set_page_config(
     page_title="🎙️ 음성 분석 & 요약 도구",
@@ -285,10 +300,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 캐시된 모델 로딩
 @st.cache_resource(show_spinner=False)
-def load_whisper_model():
-    """Load and cache Whisper model."""
+def whisper_settings():
+    """Return (model_size, device, compute_type) used for the Whisper model."""
     import torch
     
     device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -296,66 +310,129 @@ def load_whisper_model():
     # Streamlit Cloud에서는 작은 모델 사용
     model_size = "tiny" if IS_STREAMLIT_CLOUD else WHISPER_MODEL_SIZE
     
+    # CPU는 INT8, GPU는 FP16 연산 (WHISPER_COMPUTE_TYPE으로 변경 가능)
+    # Streamlit Cloud(CPU 전용 워커)에서는 메모리 대역폭을 줄이도록 항상 INT8 사용
+    if IS_STREAMLIT_CLOUD:
+        compute_type = "int8"
+    else:
+        compute_type = WHISPER_COMPUTE_TYPE or ("int8" if device == "cpu" else "float16")
+    
+    return model_size, device, compute_type
+
+# 캐시된 모델 로딩
+@st.cache_resource(show_spinner=False)
+def load_whisper_model():
+    """Load and cache Whisper model (faster-whisper / CTranslate2)."""
+    from faster_whisper import WhisperModel
+    
+    model_size, device, compute_type = whisper_settings()
+    
     with st.spinner(f"🎵 Whisper {model_size} 모델 로딩 중... (최초 1회만 실행)"):
-        model = whisper.load_model(model_size, device=device)
+        model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            download_root=WHISPER_MODEL_DIR
+        )
+        
+        # GPU 초기화(CUDA 컨텍스트, cuBLAS 핸들, 메모리 풀)를 첫 요청 대신 로딩 시점에 수행
+        if device == "cuda":
+            from audio_processor import warmup_whisper
+            warmup_whisper(model)
     
     return model
 
 @st.cache_resource(show_spinner=False)
-def load_text_processor():
-    """Load and cache text processor."""
-    from openai import OpenAI
-    
-    if not OPENAI_API_KEY:
-        return None
+def load_batched_pipeline():
+    """Load and cache batched inference pipeline (VAD 구간을 묶어 한 번에 디코딩)."""
+    from faster_whisper import BatchedInferencePipeline
     
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    return client
+    return BatchedInferencePipeline(model=load_whisper_model())
+
+# 전사 결과 디스크 캐시 (파일 내용 해시 기준, 세션/워커 간 공유)
+CACHE_DIR = Path(tempfile.gettempdir()) / "stt_cache"
+CACHE_MAX_ENTRIES = 32
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+def _load_cached_result(key):
+    """Return cached transcription result or None."""
+    return load_cached(CACHE_DIR, key)
+
+def _save_cached_result(key, result):
+    """Store transcription result and evict least recently used entries."""
+    try:
+        save_cached(CACHE_DIR, key, result, CACHE_MAX_ENTRIES)
+    except OSError as e:
+        # 캐시 저장 실패는 전사 결과에 영향을 주지 않음
+        print(f"⚠️ 전사 결과 캐시 저장 실패: {e}")
 
 # 오디오 처리 함수 (캐싱)
-@st.cache_data(show_spinner=False)
-def process_audio_cached(file_bytes, file_name, language=None):
-    """Process audio with caching."""
-    
-    # Create temp file
-    with tempfile.NamedTemporaryFile(suffix=Path(file_name).suffix, delete=False) as tmp:
-        tmp.write(file_bytes)
+def process_audio_cached(uploaded_file, language=None, on_progress=None):
+    """Process audio with caching.
+    
+    on_progress: 전사 중 누적 텍스트를 받는 콜백 (세그먼트가 디코딩될 때마다 호출)
+    """
+    
+    # 업로드 버퍼를 복사 없이 해시해 캐시 키 생성
+    # (모델 크기/연산 타입이 바뀌면 이전 모델의 전사 결과를 쓰지 않도록 키에 포함)
+    model_size, _, compute_type = whisper_settings()
+    cache_key = (
+        f"{hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()}"
+        f"_{language}_{model_size}_{compute_type}"
+    )
+    cached = _load_cached_result(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Create temp file (업로드 버퍼에서 1MB 단위로 바로 복사)
+    with tempfile.NamedTemporaryFile(suffix=Path(uploaded_file.name).suffix, delete=False) as tmp:
+        uploaded_file.seek(0)
+        shutil.copyfileobj(uploaded_file, tmp, length=1 << 20)
         tmp_path = tmp.name
     
-    processed_path = None  # 초기화 추가
-    
     try:
-        # Preprocess audio
-        audio = AudioSegment.from_file(tmp_path)
+        from faster_whisper import decode_audio
         
-        # Normalize volume
-        target_dBFS = -20.0
-        change_in_dBFS = target_dBFS - audio.dBFS
-        audio = audio.apply_gain(change_in_dBFS)
+        # Decode to 16kHz mono float32 in one pass (PyAV, ffmpeg 프로세스 없음)
+        samples = decode_audio(tmp_path, sampling_rate=16000)
         
-        # Remove silence
-        nonsilent = detect_nonsilent(audio, min_silence_len=1000, silence_thresh=-40)
-        if nonsilent:
-            processed = AudioSegment.empty()
-            for start, end in nonsilent:
-                processed += audio[max(0, start-100):min(len(audio), end+100)]
-            audio = processed
+        # Normalize volume (RMS를 -20 dBFS로 맞춤, numpy in-place 연산)
+        target_rms = 10 ** (-20.0 / 20)
+        rms = np.sqrt(np.mean(np.square(samples)))
+        samples *= target_rms / max(rms, 1e-9)
+        np.clip(samples, -1.0, 1.0, out=samples)
         
-        # Convert to 16kHz mono
-        audio = audio.set_frame_rate(16000).set_channels(1)
+        # 무음 구간은 faster-whisper의 Silero VAD가 처리
         
-        # Save processed audio
-        processed_path = tmp_path.replace(Path(tmp_path).suffix, '_processed.wav')
-        audio.export(processed_path, format='wav')
+        # Transcribe (WHISPER_BATCH_SIZE > 1이면 VAD 구간들을 배치로 묶어 디코딩)
+        if WHISPER_BATCH_SIZE > 1:
+            segments, info = load_batched_pipeline().transcribe(
+                samples,
+                language=language,
+                task="transcribe",
+                beam_size=1,
+                batch_size=WHISPER_BATCH_SIZE,
+                vad_filter=True,
+                vad_parameters=dict(min_silence_duration_ms=1000)
+            )
+        else:
+            segments, info = load_whisper_model().transcribe(
+                samples,
+                language=language,
+                task="transcribe",
+                beam_size=1,
+                vad_filter=True,
+                vad_parameters=dict(min_silence_duration_ms=1000)
+            )
         
-        # Transcribe
-        model = load_whisper_model()
-        result = model.transcribe(
-            processed_path,
-            language=language,
-            task="transcribe",
-            verbose=False
-        )
+        # segments는 generator이므로 여기서 전사가 실제로 수행됨
+        # (세그먼트가 나올 때마다 UI로 전달해 전체 전사를 기다리지 않도록 함)
+        text = ""
+        for segment in segments:
+            text += segment.text
+            if on_progress is not None:
+                on_progress(text)
+        result = {"text": text, "language": info.language}
         
         st.write(f"✅ 전사 완료!")
         st.write(f"- 전사 결과 타입: {type(result)}")
@@ -363,6 +440,7 @@ def process_audio_cached(file_bytes, file_name, language=None):
         if isinstance(result, dict) and 'text' in result:
             st.write(f"- 전사된 텍스트 길이: {len(result['text'])} 문자")
         
+        _save_cached_result(cache_key, result)
         return result
         
     except Exception as e:
@@ -373,20 +451,25 @@ def process_audio_cached(file_bytes, file_name, language=None):
         return None    
         
     finally:
-        # Cleanup - processed_path가 None이 아닐 때만 삭제
-        for path in [tmp_path, processed_path]:
-            if path and os.path.exists(path):
-                os.remove(path)
+        # Cleanup
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# 습관어 패턴 (언어별로 하나의 정규식으로 묶어 모듈 로드 시 컴파일)
+KO_FILLER_RE = re.compile(r'\b(?:음+|어+|그+|아+|있잖아|거든|이제|뭐|막|좀)\b', re.IGNORECASE)
+EN_FILLER_RE = re.compile(r'\b(?:um+|uh+|ah+|oh+|like|you know|I mean)\b', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
 
 def remove_fillers(text, language='auto'):
     """Remove filler words from text."""
-    import re
-    from collections import Counter
-    
     # Detect language
     if language == 'auto':
-        korean_chars = len(re.findall(r'[가-힣]', text))
-        english_chars = len(re.findall(r'[a-zA-Z]', text))
+        # 코드포인트 배열 한 번으로 한글/영문 글자 수 계산
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        korean_chars = np.count_nonzero((codepoints >= 0xAC00) & (codepoints <= 0xD7A3))
+        english_chars = np.count_nonzero(
+            ((codepoints >= 0x41) & (codepoints <= 0x5A)) | ((codepoints >= 0x61) & (codepoints <= 0x7A))
+        )
         total = korean_chars + english_chars
         
         if total > 0:
@@ -394,27 +477,11 @@ def remove_fillers(text, language='auto'):
         else:
             language = 'en'
     
-    # Filler patterns
-    korean_fillers = [
-        r'\b(음+|어+|그+|아+)\b',
-        r'\b(있잖아|거든|이제|뭐|막|좀)\b',
-    ]
-    english_fillers = [
-        r'\b(um+|uh+|ah+|oh+)\b',
-        r'\b(like|you know|I mean)\b',
-    ]
-    
-    patterns = korean_fillers if language == 'ko' else english_fillers
-    
-    removed = []
-    cleaned = text
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, cleaned, re.IGNORECASE)
-        removed.extend(matches)
-        cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
+    pattern = KO_FILLER_RE if language == 'ko' else EN_FILLER_RE
     
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    removed = pattern.findall(text)
+    cleaned = pattern.sub(' ', text)
+    cleaned = WHITESPACE_RE.sub(' ', cleaned).strip()
     
     return {
         'cleaned': cleaned,
@@ -422,13 +489,11 @@ def remove_fillers(text, language='auto'):
         'removed_words': dict(Counter(removed))
     }
 
-def summarize_text(text, summary_type='comprehensive'):
+# 일괄 요약 시 동시에 보내는 최대 요청 수 (rate limit 대응)
+SUMMARY_MAX_CONCURRENCY = 10
+
+async def summarize_text(client, text, summary_type='comprehensive'):
     """Summarize text using OpenAI."""
-    client = load_text_processor()
-    
-    if not client:
-        return None
-    
     prompts = {
         'comprehensive': "다음 텍스트를 종합적으로 요약해주세요:\n\n",
         'bullet_points': "다음 텍스트를 5개 이내의 핵심 포인트로 요약해주세요:\n\n",
@@ -438,7 +503,7 @@ def summarize_text(text, summary_type='comprehensive'):
     prompt = prompts.get(summary_type, prompts['comprehensive']) + text[:3000]
     
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -449,10 +514,63 @@ def summarize_text(text, summary_type='comprehensive'):
         st.error(f"요약 중 오류: {e}")
         return None
 
+async def extract_topics(client, text, num_topics=5):
+    """Extract main topics from text using OpenAI."""
+    prompt = f"""다음 텍스트에서 주요 주제/키워드를 {num_topics}개 추출해주세요.
+각 주제는 한 단어 또는 짧은 구문으로 표현해주세요.
+
+텍스트: {text[:3000]}
+
+주제 (콤마로 구분):"""
+    
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+            max_tokens=100
+        )
+        topics = [topic.strip() for topic in response.choices[0].message.content.split(',')]
+        return topics[:num_topics]
+    except Exception as e:
+        st.error(f"주제 추출 중 오류: {e}")
+        return []
+
+async def analyze_all(text, summary_type='comprehensive'):
+    """Run summary and topic extraction concurrently."""
+    from openai import AsyncOpenAI
+    
+    # 비동기 클라이언트는 이벤트 루프에 묶이므로 asyncio.run 호출마다 새로 생성
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY) as client:
+        return await asyncio.gather(
+            summarize_text(client, text, summary_type),
+            extract_topics(client, text)
+        )
+
+async def summarize_many(texts, summary_type='comprehensive'):
+    """Summarize several texts concurrently (최대 SUMMARY_MAX_CONCURRENCY건 동시 요청)."""
+    from openai import AsyncOpenAI
+    
+    semaphore = asyncio.Semaphore(SUMMARY_MAX_CONCURRENCY)
+    
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY) as client:
+        async def summarize_bounded(text):
+            async with semaphore:
+                return await summarize_text(client, text, summary_type)
+        
+        return await asyncio.gather(*(summarize_bounded(text) for text in texts))
+
 # Main UI
 def main():
     st.title("🎙️ 음성 분석 & 요약 도구")
     
+    # FFmpeg 설정 (워커당 1회만 탐색)
+    ffmpeg_path, ffprobe_path = _configure_ffmpeg()
+    if not ffmpeg_path:
+        st.warning("⚠️ FFmpeg를 찾을 수 없습니다.")
+    if not ffprobe_path:
+        st.warning("⚠️ FFprobe를 찾을 수 없습니다.")
+    
     # 경고 메시지 (Streamlit Cloud)
     if IS_STREAMLIT_CLOUD:
         st.info("☁️ Streamlit Cloud에서 실행 중 (모델: Whisper tiny, 파일 크기 제한: 50MB)")
@@ -512,7 +630,7 @@ def main():
         
         if uploaded_file:
             # File size check
-            file_size_mb = len(uploaded_file.getvalue()) / (1024 * 1024)
+            file_size_mb = uploaded_file.size / (1024 * 1024)
             if file_size_mb > MAX_FILE_SIZE_MB:
                 st.error(f"파일 크기 초과: {file_size_mb:.1f}MB (최대: {MAX_FILE_SIZE_MB}MB)")
             else:
@@ -520,13 +638,16 @@ def main():
                 
                 if st.button("🚀 처리 시작", type="primary", use_container_width=True):
                     with st.spinner("처리 중..."):
-                        # Process audio
+                        # Process audio (전사 중간 결과를 실시간 표시)
+                        live_text = st.empty()
                         result = process_audio_cached(
-                            uploaded_file.getvalue(),
-                            uploaded_file.name,
-                            language if language != "auto" else None
+                            uploaded_file,
+                            language if language != "auto" else None,
+                            on_progress=live_text.markdown
                         )
+                        live_text.empty()
                         st.session_state.transcription = result
+                        st.session_state.transcription_name = uploaded_file.name
     
     with col2:
         if 'transcription' in st.session_state and st.session_state.transcription is not None:
@@ -560,9 +681,11 @@ def main():
             # Summarize
             if OPENAI_API_KEY and st.button("📊 요약하기", use_container_width=True):
                 with st.spinner("요약 중..."):
-                    summary = summarize_text(display_text, summary_type)
+                    summary, topics = asyncio.run(analyze_all(display_text, summary_type))
                     if summary:
                         st.session_state.summary = summary
+                    if topics:
+                        st.session_state.topics = topics
             
             # Display summary
             if 'summary' in st.session_state:
@@ -570,6 +693,18 @@ def main():
                 st.subheader("✨ 요약")
                 st.info(st.session_state.summary)
             
+            if st.session_state.get('topics'):
+                with st.expander("🏷️ 주요 주제"):
+                    st.write(", ".join(st.session_state.topics))
+            
+            # 대기열 모드: 여러 파일의 요약을 모아 한 번에 동시 요청
+            if OPENAI_API_KEY and st.button("📥 요약 대기열에 추가", use_container_width=True):
+                st.session_state.setdefault('summary_queue', []).append({
+                    "name": st.session_state.get('transcription_name', 'transcription'),
+                    "text": display_text
+                })
+                st.success(f"대기열에 추가됨 ({len(st.session_state.summary_queue)}건)")
+            
             # Download
             st.divider()
             result_data = {
@@ -577,16 +712,36 @@ def main():
                 "original": text,
                 "cleaned": display_text if remove_filler else text,
                 "summary": st.session_state.get('summary', ''),
+                "topics": st.session_state.get('topics', []),
                 "language": st.session_state.transcription.get('language', 'unknown')
             }
             
             st.download_button(
                 "💾 결과 다운로드",
-                data=json.dumps(result_data, ensure_ascii=False, indent=2),
+                data=orjson.dumps(result_data, option=orjson.OPT_INDENT_2),
                 file_name=f"transcription_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json",
                 use_container_width=True
             )
+    
+    # 요약 대기열
+    summary_queue = st.session_state.get('summary_queue', [])
+    if summary_queue or st.session_state.get('batch_summaries'):
+        st.divider()
+        st.header("📚 일괄 요약")
+        
+        if summary_queue and st.button(f"🚀 대기열 요약 실행 ({len(summary_queue)}건)", type="primary"):
+            with st.spinner("일괄 요약 중..."):
+                summaries = asyncio.run(summarize_many([job["text"] for job in summary_queue], summary_type))
+            st.session_state.batch_summaries = st.session_state.get('batch_summaries', []) + [
+                {"name": job["name"], "summary": summary}
+                for job, summary in zip(summary_queue, summaries)
+            ]
+            st.session_state.summary_queue = []
+        
+        for item in st.session_state.get('batch_summaries', []):
+            with st.expander(f"📄 {item['name']}"):
+                st.write(item['summary'] or "요약 실패")
 
 if __name__ == "__main__":
     # Initialize and run
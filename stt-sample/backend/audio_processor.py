@@ -1,14 +1,58 @@
 # audio_processor.py
-import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, Optional
-import whisper
+from typing import List, Tuple, Optional
 import torch
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
 from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
 import numpy as np
 
+
+def _pick_compute_type(device: str) -> str:
+    """
+    Pick CTranslate2 compute type for the device
+    
+    INT8 weights on CPU; INT8 weights with BF16 activations on Ampere+
+    (compute capability 8.0+), FP16 activations on other GPUs with tensor
+    cores (7.x), plain FP16 on older GPUs.
+    """
+    if device == "cpu":
+        return "int8"
+    major = torch.cuda.get_device_capability()[0]
+    if major >= 8:
+        return "int8_bfloat16"
+    if major >= 7:
+        return "int8_float16"
+    return "float16"
+
+
+def _pick_batch_size(device: str, max_batch_size: int = 16) -> int:
+    """
+    Pick batched-inference size from free GPU memory
+    
+    Roughly 1 GB of free memory per batch item; CPU decodes one chunk at a time.
+    """
+    if device == "cpu":
+        return 1
+    free_bytes, _ = torch.cuda.mem_get_info()
+    return max(1, min(max_batch_size, free_bytes // (1024 ** 3)))
+
+
+def warmup_whisper(model: WhisperModel, seconds: int = 30) -> None:
+    """
+    Decode one window of silence so CUDA context/kernel/allocator setup happens at load time
+    
+    Failures are logged and ignored: the model still works without warmup.
+    """
+    try:
+        segments, _ = model.transcribe(
+            np.zeros(16000 * seconds, dtype=np.float32), language="en", beam_size=1
+        )
+        list(segments)
+    except Exception as e:
+        print(f"Whisper warmup skipped: {e}")
+
+
 class AudioProcessor:
     def __init__(self, model_size: str = "base"):
         """
@@ -19,9 +63,21 @@ class AudioProcessor:
         """
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         print(f"Loading Whisper model ({model_size}) on {self.device}...")
-        self.whisper_model = whisper.load_model(model_size, device=self.device)
+        self.whisper_model = WhisperModel(
+            model_size,
+            device=self.device,
+            compute_type=_pick_compute_type(self.device)
+        )
+        
+        # Batch VAD chunks onto the GPU together when there is room for it
+        self.batch_size = _pick_batch_size(self.device)
+        self.batched = BatchedInferencePipeline(model=self.whisper_model) if self.batch_size > 1 else None
         
-    def preprocess_audio(self, audio_file_path: str) -> str:
+        # Warm up on GPU so CUDA kernel/allocator setup isn't paid by the first real request
+        if self.device == "cuda":
+            warmup_whisper(self.whisper_model)
+        
+    def preprocess_audio(self, audio_file_path: str) -> np.ndarray:
         """
         Preprocess audio: normalize, remove silence, convert format
         
@@ -29,44 +85,76 @@ class AudioProcessor:
             audio_file_path: Path to input audio file
             
         Returns:
-            Path to preprocessed audio file
+            16kHz mono float32 samples in [-1, 1], ready to pass to Whisper
         """
-        # Load audio file
-        audio = AudioSegment.from_file(audio_file_path)
+        # Decode in-process with PyAV straight to 16kHz mono (no ffmpeg subprocess/temp WAV)
+        samples = decode_audio(audio_file_path, sampling_rate=16000)
+        audio = AudioSegment(
+            data=(np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes(),
+            sample_width=2,
+            frame_rate=16000,
+            channels=1
+        )
+        
+        # One pass over the samples feeds both normalization and silence detection
+        stats = self._stats(audio)
         
         # Normalize audio volume
-        audio = self.normalize_audio(audio)
+        target_dBFS = -20.0
+        gain = target_dBFS - stats[1] if np.isfinite(stats[1]) else 0.0
+        audio = self.normalize_audio(audio, target_dBFS, stats=stats)
         
-        # Remove long silence periods
-        audio = self.remove_silence(audio)
+        # Remove long silence periods (stats are pre-gain, so shift the threshold by the gain)
+        audio = self.remove_silence(audio, silence_thresh=-40 - gain, stats=stats)
         
-        # Convert to 16kHz mono for Whisper
-        audio = audio.set_frame_rate(16000)
-        audio = audio.set_channels(1)
+        # Hand PCM samples over in memory instead of a temp WAV round-trip
+        return np.frombuffer(audio.raw_data, dtype=np.int16).astype(np.float32) / 32768.0
+    
+    @staticmethod
+    def _stats(audio: AudioSegment) -> Tuple[np.ndarray, float]:
+        """
+        Sample statistics from a single pass over the raw samples
         
-        # Save preprocessed audio
-        temp_path = tempfile.NamedTemporaryFile(delete=False, suffix=".wav").name
-        audio.export(temp_path, format="wav")
+        Args:
+            audio: Input audio segment
+            
+        Returns:
+            (prefix sum of squared samples, dBFS) - dBFS matches pydub's audio.dBFS
+        """
+        # Interleaved channels, like audioop.rms
+        dtype = np.int64 if audio.sample_width <= 2 else np.float64
+        samples = np.array(audio.get_array_of_samples(), dtype=dtype)
+        psum = np.zeros(len(samples) + 1, dtype=dtype)
+        np.cumsum(samples * samples, out=psum[1:])
         
-        return temp_path
+        rms = int(np.sqrt(psum[-1] / len(samples))) if len(samples) else 0
+        dBFS = 20 * np.log10(rms / audio.max_possible_amplitude) if rms else -float("inf")
+        return psum, dBFS
     
-    def normalize_audio(self, audio: AudioSegment, target_dBFS: float = -20.0) -> AudioSegment:
+    def normalize_audio(self, audio: AudioSegment, target_dBFS: float = -20.0,
+                        stats: Optional[Tuple[np.ndarray, float]] = None) -> AudioSegment:
         """
         Normalize audio volume to target dBFS
         
         Args:
             audio: Input audio segment
             target_dBFS: Target volume level in dBFS
+            stats: Precomputed _stats(audio) to skip re-measuring the level
             
         Returns:
             Normalized audio segment
         """
-        change_in_dBFS = target_dBFS - audio.dBFS
+        dBFS = stats[1] if stats is not None else audio.dBFS
+        if not np.isfinite(dBFS):
+            # Digital silence: no gain can bring it to the target
+            return audio
+        change_in_dBFS = target_dBFS - dBFS
         return audio.apply_gain(change_in_dBFS)
     
     def remove_silence(self, audio: AudioSegment, 
                       min_silence_len: int = 1000,
-                      silence_thresh: int = -40) -> AudioSegment:
+                      silence_thresh: int = -40,
+                      stats: Optional[Tuple[np.ndarray, float]] = None) -> AudioSegment:
         """
         Remove silence from audio
         
@@ -74,59 +162,205 @@ class AudioProcessor:
             audio: Input audio segment
             min_silence_len: Minimum length of silence to detect (ms)
             silence_thresh: Silence threshold in dBFS
+            stats: Precomputed _stats() of the same-length audio to reuse its prefix sum
             
         Returns:
             Audio with silence removed
         """
         # Detect non-silent chunks
-        nonsilent_chunks = detect_nonsilent(
+        nonsilent_chunks = self._detect_nonsilent(
             audio,
             min_silence_len=min_silence_len,
-            silence_thresh=silence_thresh
+            silence_thresh=silence_thresh,
+            psum=stats[0] if stats is not None else None
         )
         
-        # Concatenate non-silent chunks
+        # Concatenate non-silent chunks (raw byte slices joined once)
         if nonsilent_chunks:
-            processed = AudioSegment.empty()
-            for start, end in nonsilent_chunks:
-                processed += audio[start:end]
-            return processed
+            data = audio.raw_data
+            frames_per_ms = audio.frame_rate / 1000
+            frame_width = audio.frame_width
+            parts = [
+                data[int(start * frames_per_ms) * frame_width:int(end * frames_per_ms) * frame_width]
+                for start, end in nonsilent_chunks
+            ]
+            return audio._spawn(b"".join(parts))
         return audio
     
+    @staticmethod
+    def _detect_nonsilent(audio: AudioSegment,
+                          min_silence_len: int = 1000,
+                          silence_thresh: int = -40,
+                          seek_step: int = 1,
+                          psum: Optional[np.ndarray] = None) -> list:
+        """
+        Vectorized equivalent of pydub.silence.detect_nonsilent
+        
+        Window RMS values come from a prefix sum of squared samples, so every
+        window costs O(1) instead of re-scanning its slice.
+        
+        Args:
+            audio: Input audio segment
+            min_silence_len: Minimum length of silence to detect (ms)
+            silence_thresh: Silence threshold in dBFS
+            seek_step: Step between windows (ms)
+            psum: Precomputed prefix sum of squared samples (from _stats)
+            
+        Returns:
+            List of [start, end] non-silent ranges in ms
+        """
+        seg_len = len(audio)
+        if seg_len < min_silence_len:
+            return [[0, seg_len]]
+        
+        # Prefix sum of squared samples (interleaved channels, like audioop.rms)
+        if psum is None:
+            psum = AudioProcessor._stats(audio)[0]
+        num_samples = len(psum) - 1
+        
+        # Window starts in ms (pydub also checks the last possible window)
+        last_start = seg_len - min_silence_len
+        starts = np.arange(0, last_start + 1, seek_step)
+        if last_start % seek_step:
+            starts = np.append(starts, last_start)
+        
+        # ms -> sample offsets; windows past the end are zero-padded by pydub
+        frames_per_ms = audio.frame_rate / 1000.0
+        channels = audio.channels
+        first = (starts * frames_per_ms).astype(np.int64) * channels
+        last = ((starts + min_silence_len) * frames_per_ms).astype(np.int64) * channels
+        counts = last - first
+        energy = psum[np.minimum(last, num_samples)] - psum[np.minimum(first, num_samples)]
+        rms = np.floor(np.sqrt(energy / np.maximum(counts, 1)))
+        
+        threshold = (10 ** (silence_thresh / 20.0)) * audio.max_possible_amplitude
+        silence_starts = starts[rms <= threshold]
+        
+        if len(silence_starts) == 0:
+            return [[0, seg_len]]
+        
+        # Merge overlapping silent windows into ranges
+        gaps = np.diff(silence_starts)
+        breaks = np.flatnonzero((gaps != seek_step) & (gaps > min_silence_len))
+        range_starts = np.concatenate(([silence_starts[0]], silence_starts[breaks + 1]))
+        range_ends = np.concatenate((silence_starts[breaks], [silence_starts[-1]])) + min_silence_len
+        
+        if range_starts[0] == 0 and range_ends[0] == seg_len and len(range_starts) == 1:
+            return []
+        
+        # Invert silent ranges into non-silent ranges
+        nonsilent_ranges = []
+        prev_end = 0
+        for start, end in zip(range_starts.tolist(), range_ends.tolist()):
+            nonsilent_ranges.append([prev_end, start])
+            prev_end = end
+        if prev_end != seg_len:
+            nonsilent_ranges.append([prev_end, seg_len])
+        if nonsilent_ranges[0] == [0, 0]:
+            nonsilent_ranges.pop(0)
+        
+        return nonsilent_ranges
+    
     def transcribe(self, audio_file_path: str, 
-                  language: Optional[str] = None) -> dict:
+                  language: Optional[str] = None,
+                  preprocess: bool = False) -> dict:
         """
         Transcribe audio using Whisper
         
+        Silence is skipped by faster-whisper's built-in Silero VAD, so by default
+        the original file is decoded directly without a preprocessing pass.
+        
         Args:
             audio_file_path: Path to audio file
             language: Language code (e.g., 'ko', 'en') or None for auto-detect
+            preprocess: Normalize/trim audio with pydub into in-memory samples first
             
         Returns:
             Transcription result dictionary
         """
-        # Preprocess audio
-        preprocessed_path = self.preprocess_audio(audio_file_path)
+        # Preprocess audio only when requested (in-memory samples, no temp file)
+        audio_input = self.preprocess_audio(audio_file_path) if preprocess else audio_file_path
         
-        try:
-            # Transcribe with Whisper
-            result = self.whisper_model.transcribe(
-                preprocessed_path,
-                language=language,
-                task="transcribe",
-                verbose=False
-            )
-            
-            # Add preprocessing info
-            result['preprocessed'] = True
-            result['original_file'] = audio_file_path
-            
-            return result
+        return self._transcribe_input(audio_input, audio_file_path, language, preprocess)
+    
+    def transcribe_batch(self, audio_file_paths: List[str],
+                         language: Optional[str] = None,
+                         preprocess: bool = False) -> List[dict]:
+        """
+        Transcribe several files, loading the next file while the current one is transcribed
+        
+        Decoding/preprocessing is CPU work and Whisper decoding is mostly GPU work,
+        so a single background thread keeps the next input ready.
+        
+        Args:
+            audio_file_paths: Paths to audio files
+            language: Language code (e.g., 'ko', 'en') or None for auto-detect
+            preprocess: Normalize/trim audio with pydub before transcription
             
-        finally:
-            # Clean up temp file
-            if os.path.exists(preprocessed_path):
-                os.remove(preprocessed_path)
+        Returns:
+            Transcription result dictionaries, in input order
+        """
+        if preprocess:
+            load = self.preprocess_audio
+        else:
+            def load(path):
+                return decode_audio(path, sampling_rate=16000)
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(load, audio_file_paths[0]) if audio_file_paths else None
+            for i, path in enumerate(audio_file_paths):
+                audio_input = pending.result()
+                if i + 1 < len(audio_file_paths):
+                    pending = pool.submit(load, audio_file_paths[i + 1])
+                results.append(self._transcribe_input(audio_input, path, language, preprocess))
+        
+        return results
+    
+    def _transcribe_input(self, audio_input, audio_file_path: str,
+                          language: Optional[str], preprocess: bool) -> dict:
+        """
+        Run Whisper on a file path or 16kHz float32 samples and build the result dictionary
+        """
+        # Transcribe with Whisper
+        transcribe_kwargs = dict(
+            language=language,
+            task="transcribe",
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=1000)
+        )
+        if self.batched is not None:
+            segments, info = self.batched.transcribe(
+                audio_input,
+                batch_size=self.batch_size,
+                **transcribe_kwargs
+            )
+        else:
+            segments, info = self.whisper_model.transcribe(audio_input, **transcribe_kwargs)
+        
+        # Keep the openai-whisper result layout for callers
+        segments = [
+            {
+                'id': segment.id,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'avg_logprob': segment.avg_logprob,
+                'no_speech_prob': segment.no_speech_prob
+            }
+            for segment in segments
+        ]
+        result = {
+            'text': ''.join(segment['text'] for segment in segments),
+            'segments': segments,
+            'language': info.language
+        }
+        
+        # Add preprocessing info
+        result['preprocessed'] = preprocess
+        result['original_file'] = audio_file_path
+        
+        return result
     
     def extract_segments_with_timestamps(self, result: dict) -> list:
         """
@@ -138,12 +372,12 @@ class AudioProcessor:
         Returns:
             List of segments with timestamps
         """
-        segments = []
-        for segment in result.get('segments', []):
-            segments.append({
+        return [
+            {
                 'start': segment['start'],
                 'end': segment['end'],
                 'text': segment['text'].strip(),
                 'confidence': segment.get('avg_logprob', 0)
-            })
-        return segments
\ No newline at end of file
+            }
+            for segment in result.get('segments', ())
+        ]
\ No newline at end of file
@@ -0,0 +1,23 @@
+# download_models.py
+"""Download faster-whisper models ahead of time (Docker build / deploy hook)."""
+
+import os
+import sys
+from pathlib import Path
+
+from faster_whisper import download_model
+
+MODELS_DIR = Path(os.getenv("WHISPER_MODEL_DIR", Path(__file__).parent / "models"))
+
+
+def main():
+    # 인자로 받은 모델 크기들을 미리 다운로드 (기본: WHISPER_MODEL_SIZE 또는 base)
+    model_sizes = sys.argv[1:] or [os.getenv("WHISPER_MODEL_SIZE", "base")]
+    
+    for model_size in model_sizes:
+        print(f"Downloading Whisper {model_size} model to {MODELS_DIR}...")
+        download_model(model_size, cache_dir=str(MODELS_DIR))
+
+
+if __name__ == "__main__":
+    main()
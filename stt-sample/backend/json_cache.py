@@ -0,0 +1,62 @@
+# json_cache.py
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+
+def load_cached(cache_dir: Path, key: str) -> Optional[Any]:
+    """
+    Load a cached JSON value
+
+    Args:
+        cache_dir: Cache directory
+        key: Cache key (file name without extension)
+
+    Returns:
+        Cached value, or None on a miss
+    """
+    cache_path = cache_dir / f"{key}.json"
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            value = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    # LRU 정리를 위해 사용 시각 갱신 (그 사이 다른 세션이 지웠더라도 읽은 값은 그대로 사용)
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return value
+
+
+def save_cached(cache_dir: Path, key: str, value: Any, max_entries: int) -> None:
+    """
+    Store a JSON value atomically and evict least recently used entries
+
+    Args:
+        cache_dir: Cache directory
+        key: Cache key (file name without extension)
+        value: JSON-serializable value
+        max_entries: Number of most recently used entries to keep
+
+    Raises:
+        OSError: If the entry can't be written
+    """
+    cache_path = cache_dir / f"{key}.json"
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+    # 다른 세션이 동시에 지운 항목은 건너뜀
+    entries = []
+    for path in cache_dir.glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    entries.sort(reverse=True)
+    for _, stale in entries[max_entries:]:
+        stale.unlink(missing_ok=True)
@@ -1,26 +1,43 @@
 # text_processor.py
+import hashlib
+import json
 import re
+import tempfile
+from itertools import compress
+from pathlib import Path
 from typing import List, Dict, Optional
 from collections import Counter
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.chains.summarize import load_summarize_chain
+import numpy as np
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from langchain.docstore.document import Document
+
+from json_cache import load_cached, save_cached
 
 class TextProcessor:
-    def __init__(self, openai_api_key: str):
+    SUMMARY_CACHE_MAX_ENTRIES = 128
+    SUMMARY_CHUNK_SIZE = 3000
+    SUMMARY_CHUNK_OVERLAP = 200
+    SUMMARY_SEPARATORS = ("\n\n", "\n", ". ", ", ", " ")
+    
+    def __init__(self, openai_api_key: str, cache_dir: Optional[str] = None):
         """
         Initialize text processor with LangChain and OpenAI
         
         Args:
             openai_api_key: OpenAI API key
+            cache_dir: Directory for cached summaries (defaults to a temp directory)
         """
         self.llm = ChatOpenAI(
             api_key=openai_api_key,
             model="gpt-4o-mini",
             temperature=0.3
         )
+        # JSON mode: the response is always a parseable JSON object
+        self.json_llm = self.llm.bind(response_format={"type": "json_object"})
+        
+        # 요약 결과 디스크 캐시 (정리된 텍스트의 해시가 키)
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(tempfile.gettempdir()) / "summary_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # 한국어 습관어 패턴
         self.korean_fillers = [
@@ -38,6 +55,23 @@ class TextProcessor:
             r'\b(well|so|anyway|right)\b'
         ]
         
+        # 언어별 습관어 패턴을 하나의 정규식으로 미리 컴파일
+        self._filler_res = {
+            'ko': self._compile_fillers(self.korean_fillers),
+            'en': self._compile_fillers(self.english_fillers),
+            'mixed': self._compile_fillers(self.korean_fillers + self.english_fillers),
+        }
+        self._ws_re = re.compile(r'\s+')
+        self._punct_re = re.compile(r'\s+([.,!?])')
+        self._latin_re = re.compile(r'[A-Za-z]')
+        self._bigram_rep_re = re.compile(r'\b(\w+\s+\w+)\s+\1\b')
+        self._trigram_rep_re = re.compile(r'\b(\w+\s+\w+\s+\w+)\s+\1\b')
+    
+    @staticmethod
+    def _compile_fillers(patterns: List[str]) -> re.Pattern:
+        """Combine filler patterns into a single case-insensitive alternation"""
+        return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+        
     def detect_language(self, text: str) -> str:
         """
         Detect primary language of text
@@ -48,8 +82,12 @@ class TextProcessor:
         Returns:
             Language code ('ko', 'en', or 'mixed')
         """
-        korean_chars = len(re.findall(r'[가-힣]', text))
-        english_chars = len(re.findall(r'[a-zA-Z]', text))
+        # Count Hangul syllables and Latin letters in one pass over codepoints
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        korean_chars = int(np.count_nonzero((codepoints >= 0xAC00) & (codepoints <= 0xD7A3)))
+        english_chars = int(np.count_nonzero(
+            ((codepoints >= 0x41) & (codepoints <= 0x5A)) | ((codepoints >= 0x61) & (codepoints <= 0x7A))
+        ))
         
         total_chars = korean_chars + english_chars
         if total_chars == 0:
@@ -76,28 +114,28 @@ class TextProcessor:
             Dictionary with cleaned text and statistics
         """
         if language is None:
-            language = self.detect_language(text)
+            if text.isascii():
+                # ASCII only: no Hangul, so detection reduces to "has any Latin letter"
+                language = 'en' if self._latin_re.search(text) else 'unknown'
+            else:
+                language = self.detect_language(text)
         
         original_text = text
         removed_fillers = []
         
-        # Select filler patterns based on language
-        if language == 'ko':
-            filler_patterns = self.korean_fillers
-        elif language == 'en':
-            filler_patterns = self.english_fillers
-        else:
-            filler_patterns = self.korean_fillers + self.english_fillers
+        # Select filler pattern based on language
+        filler_re = self._filler_res.get(language, self._filler_res['mixed'])
         
-        # Remove fillers and track what was removed
-        for pattern in filler_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            removed_fillers.extend(matches)
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        # Remove fillers and track what was removed (single pass)
+        def collect(match):
+            removed_fillers.append(match.group(0))
+            return ''
+        
+        text = filler_re.sub(collect, text)
         
         # Clean up extra spaces and punctuation
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\s+([.,!?])', r'\1', text)
+        text = self._ws_re.sub(' ', text)
+        text = self._punct_re.sub(r'\1', text)
         text = text.strip()
         
         # Calculate statistics
@@ -122,22 +160,81 @@ class TextProcessor:
         Returns:
             Text with repetitions removed
         """
-        # Remove immediate word repetitions
+        # Remove immediate word repetitions: map words to integer ids and
+        # keep each word whose id differs from its left neighbour
         words = text.split()
-        cleaned_words = []
-        
-        for i, word in enumerate(words):
-            if i == 0 or word.lower() != words[i-1].lower():
-                cleaned_words.append(word)
+        if words:
+            ids = {}
+            arr = np.fromiter(
+                (ids.setdefault(word.lower(), len(ids)) for word in words),
+                dtype=np.int64,
+                count=len(words)
+            )
+            keep = np.empty(len(words), dtype=bool)
+            keep[0] = True
+            np.not_equal(arr[1:], arr[:-1], out=keep[1:])
+            words = compress(words, keep)
         
-        text = ' '.join(cleaned_words)
+        text = ' '.join(words)
         
         # Remove phrase repetitions (2-3 word phrases)
-        text = re.sub(r'\b(\w+\s+\w+)\s+\1\b', r'\1', text)
-        text = re.sub(r'\b(\w+\s+\w+\s+\w+)\s+\1\b', r'\1', text)
+        text = self._bigram_rep_re.sub(r'\1', text)
+        text = self._trigram_rep_re.sub(r'\1', text)
         
         return text
     
+    @classmethod
+    def _split_text(cls, text: str) -> List[str]:
+        """
+        Split text into overlapping chunks of at most SUMMARY_CHUNK_SIZE characters
+        
+        Greedy single pass: each chunk ends at the coarsest separator found in the
+        second half of the window (or the last separator of any kind, or a hard cut).
+        """
+        size, overlap = cls.SUMMARY_CHUNK_SIZE, cls.SUMMARY_CHUNK_OVERLAP
+        chunks = []
+        start = 0
+        n = len(text)
+        
+        while start < n:
+            end = min(start + size, n)
+            if end < n:
+                # Cut positions right after each separator found inside the window
+                cuts = []
+                for sep in cls.SUMMARY_SEPARATORS:
+                    pos = text.rfind(sep, start, end)
+                    if pos != -1 and pos + len(sep) - start > overlap:
+                        cuts.append(pos + len(sep))
+                if cuts:
+                    good = [cut for cut in cuts if cut - start >= size // 2]
+                    end = good[0] if good else max(cuts)
+            
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= n:
+                break
+            
+            # Next chunk overlaps the previous one, starting on a word boundary when possible
+            next_start = end - overlap
+            space = text.find(" ", next_start, end)
+            start = space + 1 if space != -1 else next_start
+        
+        return chunks
+    
+    def _load_cached_summary(self, key: str) -> Optional[str]:
+        """Return cached summary or None"""
+        cached = load_cached(self.cache_dir, key)
+        return cached.get('summary') if isinstance(cached, dict) else None
+    
+    def _save_cached_summary(self, key: str, summary: str) -> None:
+        """Store summary and evict least recently used entries"""
+        try:
+            save_cached(self.cache_dir, key, {'summary': summary}, self.SUMMARY_CACHE_MAX_ENTRIES)
+        except OSError as e:
+            # 캐시 저장 실패는 요약 결과에 영향을 주지 않음
+            print(f"⚠️ 요약 캐시 저장 실패: {e}")
+    
     def summarize_text(self, text: str, 
                       summary_type: str = "comprehensive",
                       max_length: int = 500) -> Dict:
@@ -156,8 +253,25 @@ class TextProcessor:
         cleaned_result = self.remove_fillers(text)
         cleaned_text = self.clean_repetitions(cleaned_result['cleaned'])
         
-        # Create document for LangChain
-        doc = Document(page_content=cleaned_text)
+        return self._summarize_cleaned(text, cleaned_result, cleaned_text, summary_type, max_length)
+    
+    def _summarize_cleaned(self, text: str, cleaned_result: Dict, cleaned_text: str,
+                           summary_type: str, max_length: int) -> Dict:
+        """Summarize already-cleaned text (summarize_text after remove_fillers/clean_repetitions)"""
+        # Same cleaned text + options -> reuse the previous summary
+        cache_key = hashlib.sha256(
+            f"{summary_type}\0{max_length}\0{cleaned_text}".encode("utf-8")
+        ).hexdigest()
+        summary = self._load_cached_summary(cache_key)
+        if summary is not None:
+            return {
+                'original_length': len(text),
+                'cleaned_length': len(cleaned_text),
+                'summary': summary,
+                'summary_type': summary_type,
+                'fillers_removed': cleaned_result['total_fillers'],
+                'language': cleaned_result['language']
+            }
         
         # Choose prompt based on summary type
         if summary_type == "bullet_points":
@@ -185,29 +299,22 @@ class TextProcessor:
         )
         
         # Split text if too long
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=3000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", ". ", ", ", " "]
-        )
-        
-        docs = text_splitter.split_documents([doc])
+        chunks = self._split_text(cleaned_text)
         
         # Summarize
-        if len(docs) == 1:
+        if len(chunks) <= 1:
             # Simple summarization for short text
             summary = self.llm.invoke(
                 prompt.format(text=cleaned_text)
             ).content
         else:
-            # Map-reduce for longer text
-            chain = load_summarize_chain(
-                llm=self.llm,
-                chain_type="map_reduce",
-                map_prompt=prompt,
-                combine_prompt=prompt
-            )
-            summary = chain.run(docs)
+            # Map-reduce for longer text: map calls run concurrently, then one reduce
+            map_outputs = self.llm.batch([prompt.format(text=chunk) for chunk in chunks])
+            summary = self.llm.invoke(
+                prompt.format(text="\n\n".join(o.content for o in map_outputs))
+            ).content
+        
+        self._save_cached_summary(cache_key, summary)
         
         return {
             'original_length': len(text),
@@ -239,4 +346,59 @@ class TextProcessor:
         response = self.llm.invoke(prompt).content
         topics = [topic.strip() for topic in response.split(',')]
         
-        return topics[:num_topics]
\ No newline at end of file
+        return topics[:num_topics]
+    
+    def summarize_and_topics(self, text: str,
+                             summary_type: str = "comprehensive",
+                             num_topics: int = 5) -> Dict:
+        """
+        Summarize text and extract topics with a single LLM call
+        
+        Args:
+            text: Input text
+            summary_type: Type of summary (comprehensive, bullet_points, key_points)
+            num_topics: Number of topics to extract
+            
+        Returns:
+            Summary dictionary (same fields as summarize_text) with 'topics' added
+        """
+        # Clean text first
+        cleaned_result = self.remove_fillers(text)
+        cleaned_text = self.clean_repetitions(cleaned_result['cleaned'])
+        
+        # Text that needs map-reduce can't go in one prompt
+        if len(cleaned_text) > self.SUMMARY_CHUNK_SIZE:
+            result = self._summarize_cleaned(text, cleaned_result, cleaned_text, summary_type, 500)
+            result['topics'] = self.extract_topics(cleaned_text, num_topics)
+            return result
+        
+        if summary_type == "bullet_points":
+            instruction = "다음 내용을 핵심 포인트 위주로 불릿 포인트 형식으로 요약해주세요 (최대 5개 포인트)."
+        elif summary_type == "key_points":
+            instruction = "다음 내용에서 가장 중요한 핵심 메시지를 추출해주세요."
+        else:  # comprehensive
+            instruction = "다음 내용을 종합적으로 요약해주세요. 중요한 정보는 모두 포함하되, 간결하게 정리해주세요."
+        
+        prompt = f"""{instruction}
+그리고 주요 주제/키워드를 {num_topics}개 추출해주세요. 각 주제는 한 단어 또는 짧은 구문으로 표현해주세요.
+
+텍스트: {cleaned_text}
+
+다음 형식의 JSON 객체로만 답해주세요:
+{{"summary": "요약", "topics": ["주제1", "주제2"]}}"""
+        
+        response = self.json_llm.invoke(prompt).content
+        try:
+            data = json.loads(response)
+        except json.JSONDecodeError:
+            data = {'summary': response, 'topics': []}
+        
+        return {
+            'original_length': len(text),
+            'cleaned_length': len(cleaned_text),
+            'summary': data.get('summary', ''),
+            'summary_type': summary_type,
+            'fillers_removed': cleaned_result['total_fillers'],
+            'language': cleaned_result['language'],
+            'topics': [str(topic).strip() for topic in data.get('topics', [])][:num_topics]
+        }